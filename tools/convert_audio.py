@@ -8,7 +8,8 @@ optimized for ESP32 playback.
 Output format: 16-bit signed LE, mono, 16kHz
 
 Requirements:
-- ffmpeg (must be in PATH)
+- ffmpeg (must be in PATH), or PyAV (`pip install av`) to decode in-process;
+  neither is needed for WAVs already in the output format
 - Python 3.6+
 
 Usage:
@@ -17,80 +18,373 @@ Usage:
   python convert_audio.py *.wav                       # Convert all WAV files
   python convert_audio.py input.wav -o output.pcm    # Specify output name
   python convert_audio.py input.wav -d sounds/       # Specify output directory
+  python convert_audio.py *.wav -j 4                  # Use 4 parallel jobs
 """
 
+import shutil
 import subprocess
 import sys
 import os
 import argparse
+import functools
+import glob
+import io
+import re
+import mmap
+import struct
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def convert_to_pcm(input_file: str, output_file: str = None, output_dir: str = None) -> bool:
+try:
+    import av  # Optional: decode with libav in-process, no ffmpeg spawns
+except ImportError:
+    av = None
+
+log = logging.getLogger(__name__)
+
+# Resolve ffmpeg once instead of searching PATH on every spawn
+FFMPEG = shutil.which('ffmpeg')
+
+# Inputs per batched ffmpeg run; keeps open files and the command line
+# (32K chars on Windows) bounded, and limits re-work when a batch fails
+MAX_BATCH_INPUTS = 16
+
+
+def _init_logging(queue):
+    """Worker initializer: route all log records to the parent via queue"""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(queue)]
+    root.setLevel(logging.INFO)
+
+
+def _output_path(input_path: Path, output_dir: str = None) -> Path:
+    """Default .pcm path for input_path: in output_dir, or next to the input"""
+    if output_dir:
+        return Path(output_dir) / f"{input_path.stem}.pcm"
+    return input_path.with_suffix('.pcm')
+
+
+def _path_key(path: Path) -> str:
+    """Comparable form of path, for spotting inputs that share an output"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _log_ok(label: str, size: int):
+    """Log the size and playback duration of a finished conversion"""
+    duration_ms = (size / 2) / 16  # 16-bit = 2 bytes, 16kHz
+    log.info(f"  OK: {label} {size} bytes ({size/1024:.1f} KB, {duration_ms:.0f}ms)")
+
+
+def _progress_total_size(progress: bytes):
+    """Return the output size from the last total_size= line of ffmpeg -progress output"""
+    sizes = re.findall(rb'^total_size=(\d+)\r?$', progress, re.MULTILINE)
+    return int(sizes[-1]) if sizes else None
+
+
+def _decode_with_av(input_path: Path, out) -> int:
+    """
+    Decode and resample to 16kHz mono s16le in-process with PyAV
+    
+    Args:
+        input_path: Path to input audio file
+        out: Binary file object the PCM data is written to
+    
+    Returns:
+        Number of bytes written
+    """
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=16000)
+    written = 0
+    
+    def write(frames):
+        nonlocal written
+        # PyAV < 9 returns a single frame (or None) instead of a list
+        if frames is None:
+            return
+        if not isinstance(frames, list):
+            frames = [frames]
+        for frame in frames:
+            # Planes may be padded; s16 mono is 2 bytes per sample
+            size = frame.samples * 2
+            out.write(memoryview(frame.planes[0])[:size])
+            written += size
+    
+    with av.open(str(input_path)) as container:
+        for frame in container.decode(audio=0):
+            write(resampler.resample(frame))
+        write(resampler.resample(None))  # Flush buffered samples
+    
+    return written
+
+
+def _wav_pcm_span(input_path: Path):
+    """
+    Locate the sample data of a WAV file that is already in output format
+    
+    Walks the RIFF chunks rather than assuming a 44-byte header, since
+    many editors add LIST/fact chunks before the data.
+    
+    Returns:
+        (offset, size) of the data chunk if the file is PCM 16-bit mono
+        16kHz, None otherwise
+    """
+    try:
+        with open(input_path, 'rb') as f:
+            riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+            if riff != b'RIFF' or wave != b'WAVE':
+                return None
+            
+            fmt_ok = False
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, chunk_size = struct.unpack('<4sI', header)
+                
+                if chunk_id == b'fmt ':
+                    fmt = f.read(chunk_size + (chunk_size & 1))
+                    tag, channels, rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                    fmt_ok = (tag == 1 and channels == 1 and rate == 16000 and bits == 16)
+                    if not fmt_ok:
+                        return None
+                elif chunk_id == b'data':
+                    if not fmt_ok:
+                        return None
+                    offset = f.tell()
+                    # Streaming writers may leave the size unset (0xFFFFFFFF)
+                    size = min(chunk_size, os.fstat(f.fileno()).st_size - offset)
+                    return offset, size & ~1
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
+
+def convert_to_pcm(input_file: str, output_file: str = None, output_dir: str = None,
+                   return_bytes: bool = False):
     """
     Convert audio file to PCM format for ESP32
     
     Args:
         input_file: Path to input audio file
-        output_file: Optional output file path
-        output_dir: Optional output directory
+        output_file: Optional output file path (its directory must already exist)
+        output_dir: Optional output directory (must already exist)
+        return_bytes: Return the PCM data instead of writing a .pcm file
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise.
+        With return_bytes, the PCM data as bytes, or None on failure.
     """
+    failure = None if return_bytes else False
     input_path = Path(input_file)
     
     if not input_path.exists():
-        print(f"Error: File not found: {input_file}")
-        return False
+        log.error(f"Error: File not found: {input_file}")
+        return failure
     
     # Determine output path
-    if output_file:
+    if return_bytes:
+        out_path = None
+    elif output_file:
         out_path = Path(output_file)
-    elif output_dir:
-        out_path = Path(output_dir) / f"{input_path.stem}.pcm"
     else:
-        out_path = input_path.with_suffix('.pcm')
+        out_path = _output_path(input_path, output_dir)
+    label = out_path.name if out_path else '<bytes>'
     
-    # Create output directory if needed
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # Already 16kHz mono s16le: just strip the WAV header, no re-encode
+    span = _wav_pcm_span(input_path)
+    if span:
+        offset, size = span
+        log.info(f"Copying: {input_path.name} -> {label}")
+        try:
+            with open(input_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if return_bytes:
+                    data = mm[offset:offset + size]
+                else:
+                    with memoryview(mm) as mv:
+                        out_path.write_bytes(mv[offset:offset + size])
+        except OSError as e:
+            log.error(f"Error: {e}")
+            return failure
+        
+        _log_ok(label, size)
+        return data if return_bytes else True
+    
+    # PyAV available: decode in-process instead of spawning ffmpeg
+    if av is not None:
+        log.info(f"Decoding: {input_path.name} -> {label}")
+        try:
+            if return_bytes:
+                buf = io.BytesIO()
+                size = _decode_with_av(input_path, buf)
+            else:
+                with open(out_path, 'wb') as f:
+                    size = _decode_with_av(input_path, f)
+        except Exception as e:
+            log.error(f"Error: {e}")
+            if out_path and out_path.exists():
+                out_path.unlink()  # Don't leave a truncated .pcm behind
+            return failure
+        
+        _log_ok(label, size)
+        return buf.getvalue() if return_bytes else True
     
     # FFmpeg command for PCM output
     cmd = [
-        'ffmpeg',
+        FFMPEG or 'ffmpeg',
         '-y',                    # Overwrite output
+        '-loglevel', 'error',    # Only report errors
+        '-nostats',              # No console stats line
         '-i', str(input_path),   # Input file
-        '-f', 's16le',           # Raw PCM format
-        '-acodec', 'pcm_s16le',  # 16-bit signed little-endian
+        '-vn',                   # Ignore video (e.g. MP3 cover art)
+        '-f', 's16le',           # Raw 16-bit signed LE PCM (implies pcm_s16le)
         '-ar', '16000',          # 16kHz sample rate
         '-ac', '1',              # Mono
-        str(out_path)
     ]
+    if out_path:
+        # Report the output size on stdout so it needn't be stat'ed
+        cmd += ['-progress', 'pipe:1', str(out_path)]
+    else:
+        cmd += ['pipe:1']
     
-    print(f"Converting: {input_path.name} -> {out_path.name}")
+    log.info(f"Converting: {input_path.name} -> {label}")
     
     try:
+        # stdout carries the PCM data or the progress report; collecting it
+        # all in run() avoids pipe-buffer deadlocks. stderr stays raw bytes
+        # and is only decoded on failure
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False
         )
         
         if result.returncode != 0:
-            print(f"Error: {result.stderr}")
-            return False
+            log.error(f"Error: {result.stderr.decode(errors='replace')}")
+            return failure
         
-        # Print file size and duration
-        size = out_path.stat().st_size
-        duration_ms = (size / 2) / 16  # 16-bit = 2 bytes, 16kHz
-        print(f"  OK: {size} bytes ({size/1024:.1f} KB, {duration_ms:.0f}ms)")
-        return True
+        if return_bytes:
+            size = len(result.stdout)
+        else:
+            size = _progress_total_size(result.stdout)
+            if size is None:
+                size = out_path.stat().st_size
+        _log_ok(label, size)
+        return result.stdout if return_bytes else True
         
     except FileNotFoundError:
-        print("Error: ffmpeg not found. Please install ffmpeg and add to PATH.")
-        return False
+        log.error("Error: ffmpeg not found. Please install ffmpeg and add to PATH.")
+        return failure
     except Exception as e:
-        print(f"Error: {e}")
-        return False
+        log.error(f"Error: {e}")
+        return failure
+
+
+def convert_batch(input_files: list, output_dir: str = None) -> list:
+    """
+    Convert several audio files with batched ffmpeg invocations
+    
+    Each ffmpeg process decodes up to MAX_BATCH_INPUTS inputs and writes
+    one PCM output per input, so process startup is paid once per batch
+    instead of per file.
+    If ffmpeg fails (e.g. one corrupt input), the batch falls back to
+    converting each file on its own so good files still succeed.
+    
+    Args:
+        input_files: Paths to input audio files
+        output_dir: Optional output directory (must already exist)
+    
+    Returns:
+        List of per-file results (True if successful), in input order
+    """
+    # With PyAV there is no process startup to amortize
+    if av is not None:
+        return [convert_to_pcm(f, output_dir=output_dir) for f in input_files]
+    
+    results = [False] * len(input_files)
+    pending = []  # (index, input_path, out_path)
+    deferred = []  # Entries whose output path is already taken in this batch
+    seen = set()
+    
+    for i, input_file in enumerate(input_files):
+        input_path = Path(input_file)
+        if not input_path.exists():
+            log.error(f"Error: File not found: {input_file}")
+            continue
+        out_path = _output_path(input_path, output_dir)
+        # beep.wav and beep.mp3 both map to beep.pcm; one ffmpeg run must
+        # not write to the same file twice
+        key = _path_key(out_path)
+        if key in seen:
+            deferred.append((i, input_path))
+            continue
+        seen.add(key)
+        if _wav_pcm_span(input_path):
+            # Conformant WAVs are copied without ffmpeg
+            results[i] = convert_to_pcm(input_file, output_dir=output_dir)
+            continue
+        pending.append((i, input_path, out_path))
+    
+    for start in range(0, len(pending), MAX_BATCH_INPUTS):
+        _convert_group(pending[start:start + MAX_BATCH_INPUTS], output_dir, results)
+    
+    # Convert duplicates afterwards, in input order, so the last one wins
+    for i, input_path in deferred:
+        results[i] = convert_to_pcm(str(input_path), output_dir=output_dir)
+    
+    return results
+
+
+def _convert_group(pending: list, output_dir: str, results: list):
+    """Run one ffmpeg invocation for pending (index, input, output) entries, filling results"""
+    if len(pending) < 2:
+        for i, input_path, _ in pending:
+            results[i] = convert_to_pcm(str(input_path), output_dir=output_dir)
+        return
+    
+    cmd = [FFMPEG or 'ffmpeg', '-y', '-loglevel', 'error', '-nostats']
+    for _, input_path, _ in pending:
+        cmd += ['-i', str(input_path)]
+    for n, (_, _, out_path) in enumerate(pending):
+        cmd += [
+            '-map', f'{n}:a:0',  # s16le takes exactly one stream
+            '-f', 's16le',
+            '-ar', '16000',
+            '-ac', '1',
+            str(out_path)
+        ]
+    
+    # Progress is logged after the run: on failure the per-file retries
+    # below log their own lines
+    try:
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        returncode = result.returncode
+    except OSError:
+        # e.g. not executable, or command line too long (WinError 206);
+        # the per-file runs below report the actual error
+        returncode = None
+    
+    if returncode != 0:
+        # Retry one by one so a single bad input doesn't fail the batch
+        for i, input_path, _ in pending:
+            results[i] = convert_to_pcm(str(input_path), output_dir=output_dir)
+        return
+    
+    for i, input_path, out_path in pending:
+        log.info(f"Converting: {input_path.name} -> {out_path.name}")
+        if not out_path.exists():
+            log.error(f"Error: No output for {input_path.name}")
+            continue
+        _log_ok(out_path.name, out_path.stat().st_size)
+        results[i] = True
 
 
 def main():
@@ -102,6 +396,7 @@ Examples:
   %(prog)s input.wav                    # Convert to input.pcm
   %(prog)s input.wav -o beep.pcm        # Convert to beep.pcm
   %(prog)s *.wav -d sounds/             # Convert all WAV to sounds/
+  %(prog)s *.wav -j 4                   # Convert using 4 parallel jobs
   
 Required sound files for ESP32 audio module:
   boot.pcm, ready.pcm, beep.pcm, finger_detected.pcm,
@@ -115,21 +410,86 @@ PCM Format: 16-bit signed LE, mono, 16kHz
     parser.add_argument('files', nargs='+', help='Input audio files')
     parser.add_argument('-o', '--output', help='Output file (single input only)')
     parser.add_argument('-d', '--dir', help='Output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Parallel conversions (default: CPU count)')
     
     args = parser.parse_args()
     
-    if args.output and len(args.files) > 1:
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
+    # Expand globs ourselves (Windows shells don't) and drop duplicates
+    files = []
+    for pattern in args.files:
+        # Existing names like 'x[1].mp3' are files, not patterns
+        if os.path.exists(pattern) or glob.escape(pattern) == pattern:
+            files.append(pattern)
+        else:
+            files.extend(sorted(glob.glob(pattern)) or [pattern])
+    files = list(dict.fromkeys(os.path.normpath(f) for f in files))
+    
+    if args.output and len(files) > 1:
         print("Error: -o/--output can only be used with single input file")
         sys.exit(1)
     
-    success = 0
-    failed = 0
+    # Conformant WAVs are copied without ffmpeg; only require it if some
+    # existing input needs decoding (missing inputs are reported later)
+    needs_decoder = any(os.path.exists(f) and not _wav_pcm_span(Path(f)) for f in files)
+    if needs_decoder and FFMPEG is None and av is None:
+        print("Error: ffmpeg not found. Please install ffmpeg and add to PATH.")
+        sys.exit(1)
+    
+    # Create the output directory once, not per file
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    elif args.dir:
+        Path(args.dir).mkdir(parents=True, exist_ok=True)
     
-    for f in args.files:
-        if convert_to_pcm(f, args.output, args.dir):
-            success += 1
+    # Each ffmpeg run is CPU bound, so never spawn more workers than cores
+    jobs = max(1, min(args.jobs or 1, os.cpu_count() or 1, len(files)))
+    
+    if len(files) == 1:
+        results = [convert_to_pcm(files[0], args.output, args.dir)]
+    else:
+        # Inputs sharing an output (beep.wav, beep.mp3) would race in
+        # different workers; hold the later ones back and run them last
+        unique, repeats, seen = [], [], set()
+        for f in files:
+            key = _path_key(_output_path(Path(f), args.dir))
+            (repeats if key in seen else unique).append(f)
+            seen.add(key)
+        
+        # Split inputs into near-equal contiguous batches, at least one per
+        # worker and none over MAX_BATCH_INPUTS; each batch is converted by
+        # a single ffmpeg process
+        count = min(len(unique), max(jobs, -(-len(unique) // MAX_BATCH_INPUTS)))
+        per_batch, extra = divmod(len(unique), count)
+        batches, start = [], 0
+        for k in range(count):
+            end = start + per_batch + (1 if k < extra else 0)
+            batches.append(unique[start:end])
+            start = end
+        convert = functools.partial(convert_batch, output_dir=args.dir)
+        
+        if jobs == 1:
+            batch_results = [convert(batch) for batch in batches]
         else:
-            failed += 1
+            # Workers log through a queue drained by one listener thread,
+            # so lines from different processes never interleave
+            queue = multiprocessing.Queue()
+            listener = logging.handlers.QueueListener(queue, *logging.getLogger().handlers)
+            listener.start()
+            try:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(batches)), initializer=_init_logging,
+                                         initargs=(queue,)) as ex:
+                    batch_results = list(ex.map(convert, batches))
+            finally:
+                listener.stop()
+        
+        results = [r for batch in batch_results for r in batch]
+        results += [convert_to_pcm(f, output_dir=args.dir) for f in repeats]
+    
+    success = results.count(True)
+    failed = len(results) - success
     
     print(f"\nDone: {success} converted, {failed} failed")
     sys.exit(0 if failed == 0 else 1)
@@ -13,13 +13,19 @@ Example:
 import os
 import sys
 import shutil
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # Paths
 PROJECT_DIR = Path(__file__).parent.parent
 BUILD_DIR = PROJECT_DIR / "build"
 RELEASE_DIR = PROJECT_DIR / "release"
+DIGEST_FILE = RELEASE_DIR / ".last_digest"
 
 # Files to export
 FILES_TO_EXPORT = [
@@ -28,11 +34,83 @@ FILES_TO_EXPORT = [
     ("partition_table/partition-table.bin", "partition-table.bin"),  # Partition table
 ]
 
-def get_version():
+# FILES_TO_EXPORT resolved once: (src_name, src_path, dst_name, dst_stem, dst_ext)
+_EXPORTS = tuple(
+    (src_name, BUILD_DIR / src_name, dst_name, *os.path.splitext(dst_name))
+    for src_name, dst_name in FILES_TO_EXPORT
+)
+
+# ioctl to reflink a whole file on Linux (btrfs/XFS), _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+def _reflink(src_fd, dst_fd):
+    """Share src's blocks with dst; O(1) on copy-on-write filesystems"""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+def _copy_file_range(src_fd, dst_fd, size):
+    """In-kernel copy that NFS/SMB servers and XFS can offload (Linux 4.5+)"""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    offset = 0
+    try:
+        while offset < size:
+            copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+            if copied == 0:
+                break
+            offset += copied
+    except OSError:
+        return False
+    return offset == size
+
+def _sendfile(src_fd, dst_fd, size):
+    """Copy size bytes inside the kernel, without a userspace buffer"""
+    if not hasattr(os, "sendfile"):
+        return False
+    offset = 0
+    try:
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError:
+        return False
+    return offset == size
+
+def fast_copy(src, dst, size=None):
+    """Copy file data and metadata, preferring reflink, then in-kernel copies, then shutil.copy2"""
+    if size is None:
+        size = os.stat(src).st_size
+    
+    copied = False
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            copied = (_reflink(src_fd, dst_fd)
+                      or _copy_file_range(src_fd, dst_fd, size)
+                      or _sendfile(src_fd, dst_fd, size))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    
+    if copied:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+def get_version(now):
     """Get version string from command line or generate from date"""
     if len(sys.argv) > 1:
         return sys.argv[1]
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return now.strftime("%Y%m%d_%H%M%S")
 
 def get_firmware_info():
     """Extract firmware info from build"""
@@ -52,11 +130,67 @@ def get_firmware_info():
     
     return info
 
+def blake2b_file(path, chunk_size=512 * 1024):
+    """Hash a file through mmap, feeding zero-copy slices to BLAKE2b"""
+    import hashlib
+    import mmap
+    h = hashlib.blake2b(digest_size=8)
+    
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.hexdigest()  # empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mv = memoryview(mm)
+            try:
+                for i in range(0, len(mv), chunk_size):
+                    h.update(mv[i:i + chunk_size])
+            finally:
+                mv.release()
+    
+    return h.hexdigest()
+
+def get_build_digest():
+    """Hash the exportable build artifacts to detect an unchanged build"""
+    import hashlib
+    h = hashlib.blake2b(digest_size=8)
+    
+    for src_name, src_path, *_ in _EXPORTS:
+        try:
+            h.update(f"{src_name}:{blake2b_file(src_path)}\n".encode())
+        except FileNotFoundError:
+            continue
+    
+    return h.hexdigest()
+
+def get_last_export():
+    """Return (digest, version) of the previous export, or (None, None)"""
+    try:
+        digest, version = DIGEST_FILE.read_text().rstrip("\n").split(" ", 1)
+    except (FileNotFoundError, ValueError):
+        return None, None
+    return digest, version
+
 def export_firmware():
     """Export firmware files to release folder"""
-    version = get_version()
+    from datetime import datetime
+    
+    # One timestamp for both the version and the export date
+    now = datetime.now()
+    version = get_version(now)
     info = get_firmware_info()
     
+    # Skip the copy when the build is identical to the last export. An
+    # explicit, different version on the command line always exports.
+    digest = get_build_digest()
+    last_digest, last_version = get_last_export()
+    last_folder = RELEASE_DIR / f"v{last_version}"
+    if (digest == last_digest and (last_folder / f"firmware_v{last_version}.bin").is_file()
+            and (len(sys.argv) <= 1 or version == last_version)):
+        release_folder = last_folder
+        print(f"\n  Build unchanged, reusing v{last_version}")
+        print(f"  {release_folder}\n")
+        return release_folder
+    
     # Create release folder with version
     release_folder = RELEASE_DIR / f"v{version}"
     release_folder.mkdir(parents=True, exist_ok=True)
@@ -67,43 +201,57 @@ def export_firmware():
     print(f"{'='*60}\n")
     
     exported_files = []
+    jobs = []  # (src_path, dst_path, dst_name, versioned_name, size)
     
-    for src_name, dst_name in FILES_TO_EXPORT:
-        src_path = BUILD_DIR / src_name
-        
-        if src_path.exists():
-            # Add version to filename
-            name, ext = os.path.splitext(dst_name)
-            versioned_name = f"{name}_v{version}{ext}"
-            dst_path = release_folder / versioned_name
-            
-            shutil.copy2(src_path, dst_path)
-            size_kb = dst_path.stat().st_size / 1024
-            print(f"  ✓ {dst_name:30} -> {versioned_name} ({size_kb:.1f} KB)")
-            exported_files.append(dst_path)
-        else:
+    for src_name, src_path, dst_name, name, ext in _EXPORTS:
+        try:
+            st = src_path.stat()
+        except FileNotFoundError:
             print(f"  ✗ {src_name:30} (not found)")
+            continue
+        
+        # Add version to filename
+        versioned_name = f"{name}_v{version}{ext}"
+        dst_path = release_folder / versioned_name
+        jobs.append((src_path, dst_path, dst_name, versioned_name, st.st_size))
+    
+    # Copies are independent, so let their I/O overlap
+    def copy_job(job):
+        src_path, dst_path, _, _, size = job
+        fast_copy(src_path, dst_path, size)
+    
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as ex:
+            list(ex.map(copy_job, jobs))
+    
+    for _, dst_path, dst_name, versioned_name, size in jobs:
+        size_kb = size / 1024
+        print(f"  ✓ {dst_name:30} -> {versioned_name} ({size_kb:.1f} KB)")
+        exported_files.append(dst_path)
     
     # Create flash info file
     flash_info = release_folder / "flash_info.txt"
-    with open(flash_info, 'w') as f:
-        f.write(f"Firmware Export Info\n")
-        f.write(f"{'='*40}\n\n")
-        f.write(f"Project: {info['project']}\n")
-        f.write(f"Version: {version}\n")
-        f.write(f"Target: {info.get('target', 'esp32s3')}\n")
-        f.write(f"IDF Version: {info.get('idf_version', 'unknown')}\n")
-        f.write(f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(f"Flash Commands:\n")
-        f.write(f"--------------\n")
-        f.write(f"Full Flash:\n")
-        f.write(f"  esptool.py -p COMx -b 460800 --before default_reset --after hard_reset write_flash\n")
-        f.write(f"    0x0 bootloader_v{version}.bin\n")
-        f.write(f"    0x8000 partition-table_v{version}.bin\n")
-        f.write(f"    0x20000 firmware_v{version}.bin\n\n")
+    flash_info.write_text(
+        f"Firmware Export Info\n"
+        f"{'='*40}\n\n"
+        f"Project: {info['project']}\n"
+        f"Version: {version}\n"
+        f"Target: {info.get('target', 'esp32s3')}\n"
+        f"IDF Version: {info.get('idf_version', 'unknown')}\n"
+        f"Export Date: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        f"Flash Commands:\n"
+        f"--------------\n"
+        f"Full Flash:\n"
+        f"  esptool.py -p COMx -b 460800 --before default_reset --after hard_reset write_flash\n"
+        f"    0x0 bootloader_v{version}.bin\n"
+        f"    0x8000 partition-table_v{version}.bin\n"
+        f"    0x20000 firmware_v{version}.bin\n\n"
+    )
     
     print(f"\n  ✓ Flash info: flash_info.txt")
     
+    DIGEST_FILE.write_text(f"{digest} {version}\n")
+    
     print(f"\n{'='*60}")
     print(f"  Export complete! Files saved to:")
     print(f"  {release_folder}")
@@ -112,15 +260,15 @@ def export_firmware():
     return release_folder
 
 def main():
-    # Check if build exists
-    if not BUILD_DIR.exists():
-        print("Error: Build directory not found!")
-        print("Please run 'idf.py build' first.")
-        sys.exit(1)
-    
+    # Check if build exists (one stat; the build dir is only probed on failure)
     main_bin = BUILD_DIR / "AS608-ESP32s3.bin"
-    if not main_bin.exists():
-        print("Error: Firmware binary not found!")
+    try:
+        main_bin.stat()
+    except FileNotFoundError:
+        if not BUILD_DIR.exists():
+            print("Error: Build directory not found!")
+        else:
+            print("Error: Firmware binary not found!")
         print("Please run 'idf.py build' first.")
         sys.exit(1)
     